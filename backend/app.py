@@ -1,56 +1,121 @@
 from __future__ import annotations
 
+import hmac
+import os
+import threading
+import uuid
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 try:  # pragma: no cover - prefer real Flask when available
-    from flask import Flask, jsonify, request, send_from_directory
+    from flask import Flask, Response, jsonify, request
 except ModuleNotFoundError:  # pragma: no cover - used in constrained environments
     try:
-        from backend.flask_stub import Flask, jsonify, request, send_from_directory
+        from backend.flask_stub import Flask, Response, jsonify, request
     except ModuleNotFoundError:  # pragma: no cover - fallback when imported as top-level script
-        from flask_stub import Flask, jsonify, request, send_from_directory
+        from flask_stub import Flask, Response, jsonify, request
 
-from gee_extractor.runner import run_extraction
+try:  # pragma: no cover - package import when run as ``backend.app``
+    from backend.profiling import PROFILE_HEADER, REQUEST_ID_HEADER, RequestProfiler
+    from backend.static_assets import AssetTable
+except ModuleNotFoundError:  # pragma: no cover - fallback when imported as top-level script
+    from profiling import PROFILE_HEADER, REQUEST_ID_HEADER, RequestProfiler
+    from static_assets import AssetTable
 
+from gee_extractor.jobs import JOB_DB_ENV, JobStore
+from gee_extractor.runner import resume_incomplete_jobs, run_extraction
 
-def create_app() -> Flask:
-    app = Flask(
-        __name__,
-        static_folder=str(Path(__file__).resolve().parent.parent / "dist"),
-        static_url_path="",
-    )
+
+DIST_DIR = Path(__file__).resolve().parent.parent / "dist"
+ADMIN_TOKEN_ENV = "GEE_EXTRACTOR_ADMIN_TOKEN"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def create_app(
+    job_store: Optional[JobStore] = None,
+    dist_dir: Path = DIST_DIR,
+    profiler: Optional[RequestProfiler] = None,
+    resume_jobs: bool = True,
+) -> Flask:
+    # Static files are served from an in-memory table loaded once at startup,
+    # so Flask's own static route is disabled.
+    app = Flask(__name__, static_folder=None)
+    assets = AssetTable(dist_dir)
+    profiler = profiler or RequestProfiler.from_env()
+
+    if job_store is None and os.environ.get(JOB_DB_ENV):
+        job_store = JobStore(Path(os.environ[JOB_DB_ENV]))
+    if job_store is not None and resume_jobs:
+        # Snapshot before serving so jobs created by new requests are not resumed twice.
+        interrupted = job_store.incomplete_jobs()
+        threading.Thread(target=resume_incomplete_jobs, args=(job_store, interrupted), daemon=True).start()
 
     @app.post("/api/run-extraction")
     def api_run_extraction():
         data: Dict[str, Any] = request.get_json(force=True)  # type: ignore[assignment]
+        profile_name = None
         try:
-            result = run_extraction(data)
+            if profiler.should_profile(request.headers.get(PROFILE_HEADER)):
+                result, profile_name = profiler.run(
+                    lambda: run_extraction(data, job_store=job_store),
+                    request_id=request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex,
+                    label=data.get("satelliteId"),
+                )
+            else:
+                result = run_extraction(data, job_store=job_store)
         except ValueError as exc:
             return jsonify({"status": "error", "message": str(exc)}), 400
         except Exception as exc:  # pragma: no cover - unexpected failure
             return jsonify({"status": "error", "message": str(exc)}), 500
-        return jsonify(result)
+        response = jsonify(result)
+        if profile_name is not None:
+            response.headers["X-Profile-Name"] = profile_name
+        return response
+
+    def _admin_allowed() -> bool:
+        token = os.environ.get(ADMIN_TOKEN_ENV)
+        supplied = request.headers.get(ADMIN_TOKEN_HEADER, "")
+        return profiler.enabled and bool(token) and hmac.compare_digest(supplied, token)
+
+    @app.route("/api/admin/profiles")
+    def api_list_profiles():
+        if not _admin_allowed():
+            return jsonify({"status": "error", "message": "Not Found"}), 404
+        return jsonify({"status": "success", "profiles": profiler.list_profiles()})
+
+    @app.route("/api/admin/profiles/<name>")
+    def api_show_profile(name):
+        report = profiler.render(name) if _admin_allowed() else None
+        if report is None:
+            return jsonify({"status": "error", "message": "Not Found"}), 404
+        return Response(report, status=200, headers={"Content-Type": "text/plain; charset=utf-8"})
+
+    def serve_asset(path: str):
+        asset = assets.resolve(path)
+        if asset is None:
+            if assets.index is None:
+                return "Frontend build not found. Please run 'npm run build'.", 200
+            return jsonify({"status": "error", "message": "Not Found"}), 404
+        body, status, headers = assets.respond(
+            asset,
+            if_none_match=request.headers.get("If-None-Match", ""),
+            accept_encoding=request.headers.get("Accept-Encoding", ""),
+        )
+        return Response(body, status=status, headers=headers)
 
     @app.route("/")
-    def index():  # pragma: no cover - requires built frontend
-        dist_path = Path(app.static_folder)
-        index_file = dist_path / "index.html"
-        if index_file.exists():
-            return send_from_directory(dist_path, "index.html")
-        return "Frontend build not found. Please run 'npm run build'.", 200
+    def index():
+        return serve_asset("index.html")
 
     @app.route("/<path:path>")
-    def serve_static(path):  # pragma: no cover - requires built frontend
-        dist_path = Path(app.static_folder)
-        file_path = dist_path / path
-        if file_path.exists():
-            return send_from_directory(dist_path, path)
-        return send_from_directory(dist_path, "index.html")
+    def serve_static(path):
+        return serve_asset(path)
 
     return app
 
 
 if __name__ == "__main__":  # pragma: no cover
-    app = create_app()
+    # With debug=True the reloader parent also runs this module; only the child
+    # (WERKZEUG_RUN_MAIN set) serves requests and should resume jobs.
+    app = create_app(resume_jobs=os.environ.get("WERKZEUG_RUN_MAIN") == "true")
     app.run(host="0.0.0.0", port=5000, debug=True)
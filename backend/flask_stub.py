@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple
 
 
 @dataclass
-class _Request:
+class _Request(threading.local):
+    """Per-thread request state, so concurrent test clients do not interfere."""
+
     json: Optional[Dict[str, Any]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
 
     def get_json(self, force: bool = False) -> Dict[str, Any]:
         if self.json is not None:
@@ -23,23 +28,39 @@ request = _Request()
 
 
 class Response:
-    def __init__(self, data: Any, status_code: int = 200):
+    def __init__(self, data: Any = None, status: int = 200, headers: Optional[Dict[str, str]] = None):
         self.data = data
-        self.status_code = status_code
+        self.status_code = status
+        self.headers: Dict[str, str] = dict(headers or {})
 
     def get_json(self) -> Any:
         return self.data
 
+    def get_data(self, as_text: bool = False) -> Any:
+        if as_text and isinstance(self.data, bytes):
+            return self.data.decode("utf-8")
+        return self.data
+
 
 def jsonify(data: Any) -> Response:
-    return Response(data, status_code=200)
+    return Response(data, status=200)
 
 
 def send_from_directory(directory: Path, filename: str) -> str:
     return str(Path(directory) / filename)
 
 
-ViewFunc = Callable[[], Any]
+ViewFunc = Callable[..., Any]
+
+_RULE_VARIABLE = re.compile(r"<(?:(path):)?(\w+)>")
+
+
+def _compile_rule(rule: str) -> "re.Pattern[str]":
+    def replace(match: "re.Match[str]") -> str:
+        converter, name = match.groups()
+        return f"(?P<{name}>.+)" if converter == "path" else f"(?P<{name}>[^/]+)"
+
+    return re.compile("^" + _RULE_VARIABLE.sub(replace, rule) + "$")
 
 
 class Flask:
@@ -59,14 +80,29 @@ class Flask:
 
         return decorator
 
+    def get(self, rule: str) -> Callable[[ViewFunc], ViewFunc]:
+        return self.route(rule, methods=["GET"])
+
     def post(self, rule: str) -> Callable[[ViewFunc], ViewFunc]:
         return self.route(rule, methods=["POST"])
 
+    def _match(self, method: str, path: str) -> Tuple[Optional[ViewFunc], Dict[str, str]]:
+        func = self._routes.get((method, path))
+        if func is not None:
+            return func, {}
+        for (route_method, rule), candidate in self._routes.items():
+            if route_method != method or "<" not in rule:
+                continue
+            match = _compile_rule(rule).match(path)
+            if match:
+                return candidate, match.groupdict()
+        return None, {}
+
     def dispatch_request(self, method: str, path: str) -> Response:
-        func = self._routes.get((method.upper(), path))
+        func, kwargs = self._match(method.upper(), path)
         if func is None:
-            return Response({"status": "error", "message": "Not Found"}, status_code=404)
-        result = func()
+            return Response({"status": "error", "message": "Not Found"}, status=404)
+        result = func(**kwargs)
         if isinstance(result, Response):
             return result
         if isinstance(result, tuple):
@@ -74,18 +110,27 @@ class Flask:
             if isinstance(payload, Response):
                 payload.status_code = status_code
                 return payload
-            return Response(payload, status_code=status_code)
+            return Response(payload, status=status_code)
         return Response(result)
 
     def test_client(self):
         app = self
 
         class _Client:
-            def post(self, path: str, json: Optional[Dict[str, Any]] = None):
+            def open(self, method: str, path: str, json: Optional[Dict[str, Any]] = None, headers=None):
                 request.json = json
-                response = app.dispatch_request("POST", path)
-                request.json = None
-                return response
+                request.headers = dict(headers or {})
+                try:
+                    return app.dispatch_request(method, path)
+                finally:
+                    request.json = None
+                    request.headers = {}
+
+            def get(self, path: str, headers: Optional[Dict[str, str]] = None):
+                return self.open("GET", path, headers=headers)
+
+            def post(self, path: str, json: Optional[Dict[str, Any]] = None, headers=None):
+                return self.open("POST", path, json=json, headers=headers)
 
         return _Client()
 
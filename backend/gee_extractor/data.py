@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 
+@dataclass(frozen=True)
+class BandPacking:
+    """Integer encoding for a band: ``value = packed * scale + offset``."""
+
+    scale: float
+    offset: float
+    dtype: str
+    nodata: int
+
+
 @dataclass(frozen=True)
 class Satellite:
     id: str
     ee_collection_name: str
     pixel_size: int
     default_bands: List[str]
+    packing: Dict[str, BandPacking] = field(default_factory=dict)
+    sub_daily: bool = False
 
 
 @dataclass(frozen=True)
@@ -22,18 +34,37 @@ class Mask:
     filters: List[str]
 
 
+_ERA5_TEMPERATURE_PACKING = BandPacking(scale=0.01, offset=273.15, dtype="int16", nodata=-32768)
+
+_ERA5_PACKING: Dict[str, BandPacking] = {
+    "dewpoint_temperature_2m": _ERA5_TEMPERATURE_PACKING,
+    "temperature_2m": _ERA5_TEMPERATURE_PACKING,
+    "skin_temperature": _ERA5_TEMPERATURE_PACKING,
+}
+
 SATELLITES: Dict[str, Satellite] = {
     "CHIRPS_DAILY": Satellite(
         id="CHIRPS_DAILY",
         ee_collection_name="UCSB-CHG/CHIRPS/DAILY",
         pixel_size=5566,
         default_bands=["precipitation"],
+        packing={
+            "precipitation": BandPacking(scale=0.1, offset=0.0, dtype="uint16", nodata=65535),
+        },
     ),
     "MODIS_MOD13Q1_061": Satellite(
         id="MODIS_MOD13Q1_061",
         ee_collection_name="MODIS/061/MOD13Q1",
         pixel_size=250,
         default_bands=["NDVI", "EVI", "DetailedQA"],
+        # NDVI/EVI pack to int16 on their own. DetailedQA uses all 16 bits, so it
+        # cannot share int16 losslessly with a nodata value left over. Exports that
+        # include it widen to int32, the same type as the unpacked source.
+        packing={
+            "NDVI": BandPacking(scale=1.0, offset=0.0, dtype="int16", nodata=-32768),
+            "EVI": BandPacking(scale=1.0, offset=0.0, dtype="int16", nodata=-32768),
+            "DetailedQA": BandPacking(scale=1.0, offset=0.0, dtype="uint16", nodata=65535),
+        },
     ),
     "ERA5_LAND_HOURLY": Satellite(
         id="ERA5_LAND_HOURLY",
@@ -44,6 +75,8 @@ SATELLITES: Dict[str, Satellite] = {
             "temperature_2m",
             "skin_temperature",
         ],
+        packing=_ERA5_PACKING,
+        sub_daily=True,
     ),
     "ERA5_LAND_DAILY_AGGR": Satellite(
         id="ERA5_LAND_DAILY_AGGR",
@@ -54,6 +87,7 @@ SATELLITES: Dict[str, Satellite] = {
             "temperature_2m",
             "skin_temperature",
         ],
+        packing=_ERA5_PACKING,
     ),
 }
 
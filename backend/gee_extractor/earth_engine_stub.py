@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime as _dt
+import json
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
@@ -64,6 +65,7 @@ class Date:
 class FakeImage:
     name: str
     timestamp: _dt.datetime
+    band_names: Optional[List[str]] = None
 
     def get(self, key: str) -> Any:
         if key == "system:time_start":
@@ -82,6 +84,45 @@ class FakeImage:
     def neq(self, value: int) -> "FakeImage":
         return self
 
+    def _derive(self, operation: str) -> "FakeImage":
+        return FakeImage(name=f"{self.name}|{operation}", timestamp=self.timestamp, band_names=self.band_names)
+
+    def subtract(self, value: float) -> "FakeImage":
+        return self._derive(f"subtract({value})")
+
+    def divide(self, value: float) -> "FakeImage":
+        return self._derive(f"divide({value})")
+
+    def round(self) -> "FakeImage":
+        return self._derive("round")
+
+    def unmask(self, value: float) -> "FakeImage":
+        return self._derive(f"unmask({value})")
+
+    def toUint8(self) -> "FakeImage":  # noqa: N802
+        return self._derive("uint8")
+
+    def toInt8(self) -> "FakeImage":  # noqa: N802
+        return self._derive("int8")
+
+    def toUint16(self) -> "FakeImage":  # noqa: N802
+        return self._derive("uint16")
+
+    def toInt16(self) -> "FakeImage":  # noqa: N802
+        return self._derive("int16")
+
+    def toInt32(self) -> "FakeImage":  # noqa: N802
+        return self._derive("int32")
+
+    def rename(self, names: List[str]) -> "FakeImage":
+        return FakeImage(name=self.name, timestamp=self.timestamp, band_names=list(names))
+
+
+class Image:
+    @staticmethod
+    def cat(images: List[FakeImage]) -> FakeImage:
+        return FakeImage(name="cat(" + ",".join(image.name for image in images) + ")", timestamp=images[0].timestamp)
+
 
 class _Size(Number):
     pass
@@ -104,11 +145,16 @@ class ImageCollection:
             ]
         self.filters: List[FakeFilter] = []
         self.selected_bands: Optional[Iterable[str]] = None
+        self.bounds_filter: Optional["Geometry"] = None
 
     def filter(self, fake_filter: FakeFilter) -> "ImageCollection":
         self.filters.append(fake_filter)
         return self
 
+    def filterBounds(self, geometry: "Geometry") -> "ImageCollection":  # noqa: N802
+        self.bounds_filter = geometry
+        return self
+
     def filterDate(self, start: Date, end: Date) -> "ImageCollection":  # noqa: N802
         filtered = [
             image for image in self.images if start._dt <= image.timestamp <= end._dt
@@ -123,6 +169,26 @@ class ImageCollection:
         self.images = [func(image) for image in self.images]
         return self
 
+    def sort(self, prop: str, ascending: bool = True) -> "ImageCollection":
+        if prop != "system:time_start":
+            raise ValueError("Stub only supports sorting by system:time_start")
+        ordered = ImageCollection(sorted(self.images, key=lambda image: image.timestamp, reverse=not ascending))
+        ordered.selected_bands = self.selected_bands
+        return ordered
+
+    def aggregate_array(self, prop: str) -> _InfoObject:
+        return _InfoObject([image.get(prop) for image in self.images])
+
+    def aggregate_max(self, prop: str) -> _InfoObject:
+        values = [image.get(prop) for image in self.images]
+        return _InfoObject(max(values) if values else None)
+
+    def toList(self, count: int, offset: int = 0) -> List[FakeImage]:  # noqa: N802
+        return self.images[offset : offset + count]
+
+    def toBands(self) -> FakeImage:  # noqa: N802
+        return FakeImage(name=f"stack_{self.collection_id}_{len(self.images)}", timestamp=self.images[0].timestamp)
+
     def size(self) -> _Size:
         return _Size(len(self.images))
 
@@ -150,8 +216,11 @@ class Geometry:
     def bounds(self) -> "Geometry":
         return self
 
+    def area(self, maxError: float = 0) -> Number:  # noqa: N803
+        return Number(0)
+
     def toGeoJSONString(self) -> str:  # noqa: N802
-        return "{\"type\": \"Point\"}"
+        return json.dumps({"type": "Point", "coordinates": self.coords})
 
 
 class batch:
@@ -163,11 +232,16 @@ class batch:
 
 
 class FakeTask:
+    _counter = 0
+
     def __init__(self, params: Dict[str, Any]):
         self.params = params
         self.started = False
+        self.id: Optional[str] = None
 
     def start(self) -> None:
+        FakeTask._counter += 1
+        self.id = f"FAKE_TASK_{FakeTask._counter}"
         self.started = True
 
 
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import datetime as _dt
+import json
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from .data import BandPacking
 from .engine import ee
 
 
@@ -17,6 +22,91 @@ class ExportResult:
     extra: Dict[str, str]
 
 
+# Upper bound on bands in one stacked export; larger stacks are split by date.
+MAX_STACK_BANDS = 1000
+# Earth Engine rejects getDownloadURL requests above this many bytes.
+MAX_DOWNLOAD_BYTES = 50331648
+# Bytes assumed per pixel and band when estimating unpacked download sizes.
+DEFAULT_BYTES_PER_BAND = 8
+
+# Integer dtypes usable for packing, from narrowest to widest: (min, max, bytes, cast method).
+PACKING_DTYPES = {
+    "uint8": (0, 255, 1, "toUint8"),
+    "int8": (-128, 127, 1, "toInt8"),
+    "uint16": (0, 65535, 2, "toUint16"),
+    "int16": (-32768, 32767, 2, "toInt16"),
+    "int32": (-2147483648, 2147483647, 4, "toInt32"),
+}
+
+
+def common_packing_dtype(dtypes: Iterable[str]) -> str:
+    """Return the narrowest packing dtype able to hold every dtype in ``dtypes``.
+
+    Exported images share one data type, so mixed bands such as ``int16`` and
+    ``uint16`` are widened to ``int32``.
+    """
+
+    dtypes = list(dtypes)
+    ranges = [PACKING_DTYPES[dtype] for dtype in dtypes]
+    low = min(dtype_range[0] for dtype_range in ranges)
+    high = max(dtype_range[1] for dtype_range in ranges)
+    for name, (dtype_min, dtype_max, _size, _cast) in PACKING_DTYPES.items():
+        if dtype_min <= low and high <= dtype_max:
+            return name
+    raise ValueError(f"No packing dtype can hold {', '.join(dtypes)}")
+
+
+def stack_band_names(timestamps: List[float], bands: List[str]) -> List[str]:
+    """Return deterministic ``<band>_<YYYYMMDD>`` names for a temporal stack.
+
+    Timestamps are ``system:time_start`` values in milliseconds. When two images
+    share a calendar day (e.g. hourly collections) the time of day is appended.
+    """
+
+    moments = [_dt.datetime.fromtimestamp(ts / 1000, tz=_dt.timezone.utc) for ts in timestamps]
+    days = [moment.strftime("%Y%m%d") for moment in moments]
+    if len(set(days)) != len(days):
+        days = [moment.strftime("%Y%m%dT%H%M") for moment in moments]
+
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for day in days:
+        suffix = day
+        if day in seen:
+            seen[day] += 1
+            suffix = f"{day}_{seen[day]}"
+        else:
+            seen[day] = 0
+        names.extend(f"{band}_{suffix}" for band in bands)
+    return names
+
+
+def geojson_bounds(geojson: str) -> Tuple[float, float, float, float]:
+    """Return ``(west, south, east, north)`` for a GeoJSON geometry string."""
+
+    points: List[Tuple[float, float]] = []
+
+    def collect(coords) -> None:
+        if coords and isinstance(coords[0], (int, float)):
+            points.append((coords[0], coords[1]))
+        else:
+            for item in coords:
+                collect(item)
+
+    geometry = json.loads(geojson)
+    for part in geometry.get("geometries", [geometry]):
+        collect(part["coordinates"])
+    lons = [lon for lon, _ in points]
+    lats = [lat for _, lat in points]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+# Prepared mask images keyed by collection, band, filters and AOI bounds.
+_MASK_CACHE: "OrderedDict[Tuple, object]" = OrderedDict()
+_MASK_CACHE_LOCK = threading.Lock()
+MASK_CACHE_SIZE = 64
+
+
 class Mask:
     """Handles the creation of a mask layer from a GEE collection."""
 
@@ -26,16 +116,45 @@ class Mask:
         self.band = band
         self.mask_image = None
 
-    def prepare(self):
-        if self.mask_image is not None:
-            return self.mask_image
-
+    def _cache_key(self, aoi) -> Tuple:
+        # The mask only depends on the AOI's bounds, so AOIs sharing a bounding
+        # box share an entry. The box is computed client-side from the GeoJSON
+        # rather than with ``bounds()``, which would need a server round trip.
+        bounds = geojson_bounds(aoi.toGeoJSONString()) if aoi is not None else None
+        return (self.collection_name, self.band, tuple(sorted(self.filters.items())), bounds)
+
+    def prepare(self, aoi=None):
+        """Return the mask image, restricted to the bounds of ``aoi`` when given.
+
+        Only mask tiles intersecting the AOI's bounds are mosaicked, and the
+        result is cached per combination of AOI bounds and filters.
+        """
+
+        key = self._cache_key(aoi)
+        with _MASK_CACHE_LOCK:
+            cached = _MASK_CACHE.get(key)
+            if cached is not None:
+                _MASK_CACHE.move_to_end(key)
+        if cached is not None:
+            self.mask_image = cached
+            return cached
+
+        region = aoi.bounds() if aoi is not None else None
         collection = ee.ImageCollection(self.collection_name)
-        for key, value in self.filters.items():
-            collection = collection.filter(ee.Filter.eq(key, value))
+        if region is not None:
+            collection = collection.filterBounds(region)
+        for key_name, value in self.filters.items():
+            collection = collection.filter(ee.Filter.eq(key_name, value))
 
+        # No clip: a point AOI has zero-area bounds, and clipping to them could mask
+        # the very pixel being sampled. filterBounds already limits the mosaic.
         image = collection.mosaic()
         self.mask_image = image.select(self.band).neq(0)
+
+        with _MASK_CACHE_LOCK:
+            _MASK_CACHE[key] = self.mask_image
+            if len(_MASK_CACHE) > MASK_CACHE_SIZE:
+                _MASK_CACHE.popitem(last=False)
         return self.mask_image
 
 
@@ -53,6 +172,7 @@ class DataExtractor:
         bands: Iterable[str],
         scale: int,
         mask: Optional[Mask] = None,
+        packing: Optional[Dict[str, BandPacking]] = None,
     ):
         self.collection_name = collection_name
         self.start_year = start_year
@@ -64,18 +184,64 @@ class DataExtractor:
         self.scale = scale
         self.image_collection = ee.ImageCollection(self.collection_name)
         self.mask = mask
-
-    def _filter_year(self, year: int):
-        start_date = ee.Date.fromYMD(year, 1, 1).advance(self.start_doy - 1, "day")
+        self.packing = self._select_packing(packing)
+        self.packing_dtype = (
+            common_packing_dtype(spec.dtype for spec in self.packing.values()) if self.packing else None
+        )
+
+    def _select_packing(self, packing: Optional[Dict[str, BandPacking]]) -> Dict[str, BandPacking]:
+        # Exports share one dtype, so pack only when every selected band is described.
+        if not packing or any(band not in packing for band in self.bands):
+            return {}
+        return {band: packing[band] for band in self.bands}
+
+    def _pack(self, image):
+        if not self.packing:
+            return image
+
+        packed = [
+            image.select(band).subtract(spec.offset).divide(spec.scale).round().unmask(spec.nodata)
+            for band, spec in self.packing.items()
+        ]
+        return getattr(ee.Image.cat(packed), PACKING_DTYPES[self.packing_dtype][3])()
+
+    def _packing_details(self) -> Dict[str, str]:
+        if not self.packing:
+            return {}
+
+        details = {"packing_dtype": self.packing_dtype}
+        for band, spec in self.packing.items():
+            details[f"{band}_scale"] = str(spec.scale)
+            details[f"{band}_offset"] = str(spec.offset)
+            details[f"{band}_nodata"] = str(spec.nodata)
+        return details
+
+    def _year_window(self, year: int) -> Tuple[_dt.date, _dt.date]:
+        start_date = _dt.date(year, 1, 1) + _dt.timedelta(days=self.start_doy - 1)
         end_year = year + 1 if self.start_doy > self.end_doy else year
-        end_date = ee.Date.fromYMD(end_year, 1, 1).advance(self.end_doy - 1, "day")
+        end_date = _dt.date(end_year, 1, 1) + _dt.timedelta(days=self.end_doy - 1)
+        return start_date, end_date
+
+    def date_windows(self) -> List[Tuple[_dt.date, _dt.date]]:
+        """Return the ``[start, end)`` date window covered for each year."""
+
+        return [self._year_window(year) for year in range(self.start_year, self.end_year + 1)]
+
+    def _filter_window(self, start: _dt.date, end: _dt.date):
+        start_date = ee.Date.fromYMD(start.year, start.month, start.day)
+        end_date = ee.Date.fromYMD(end.year, end.month, end.day)
         return self.image_collection.filterDate(start_date, end_date)
 
-    def process(self) -> int:
+    def process(self, windows: Optional[List[Tuple[_dt.date, _dt.date]]] = None) -> int:
+        """Filter the collection to ``windows`` (all yearly windows by default)."""
+
+        if windows is None:
+            windows = self.date_windows()
+
         filtered = None
-        for year in range(self.start_year, self.end_year + 1):
-            yearly = self._filter_year(year)
-            filtered = yearly if filtered is None else filtered.merge(yearly)
+        for start, end in windows:
+            windowed = self._filter_window(start, end)
+            filtered = windowed if filtered is None else filtered.merge(windowed)
 
         if filtered is None:
             filtered = ee.ImageCollection([])
@@ -83,7 +249,7 @@ class DataExtractor:
         filtered = filtered.select(self.bands)
 
         if self.mask is not None:
-            mask_image = self.mask.prepare()
+            mask_image = self.mask.prepare(self.aoi)
 
             def apply_mask(image):  # pragma: no cover - lambda equivalent
                 return image.updateMask(mask_image)
@@ -93,6 +259,14 @@ class DataExtractor:
         self.image_collection = filtered
         return int(filtered.size().getInfo())
 
+    def last_image_date(self) -> Optional[_dt.date]:
+        """Return the UTC date of the latest image in the processed collection."""
+
+        timestamp = self.image_collection.aggregate_max("system:time_start").getInfo()
+        if timestamp is None:
+            return None
+        return _dt.datetime.fromtimestamp(timestamp / 1000, tz=_dt.timezone.utc).date()
+
     def export(self, export_method: str, drive_folder: str, file_name_prefix: str) -> ExportResult:
         size = int(self.image_collection.size().getInfo())
         if size == 0:
@@ -101,6 +275,7 @@ class DataExtractor:
         image_to_export = self.image_collection.first()
         image_date = ee.Date(image_to_export.get("system:time_start")).format("YYYY-MM-dd").getInfo()
         final_prefix = f"{file_name_prefix}_{image_date}"
+        image_to_export = self._pack(image_to_export)
 
         if export_method == "drive":
             task = ee.batch.Export.image.toDrive(
@@ -115,7 +290,12 @@ class DataExtractor:
             return ExportResult(
                 method="drive",
                 description="task-started",
-                extra={"task_description": final_prefix, "drive_folder": drive_folder},
+                extra={
+                    "task_description": final_prefix,
+                    "task_id": str(task.id),
+                    "drive_folder": drive_folder,
+                    **self._packing_details(),
+                },
             )
 
         if export_method == "local":
@@ -128,10 +308,116 @@ class DataExtractor:
                     "name": final_prefix,
                 }
             )
-            return ExportResult(method="local", description="url-generated", extra={"download_url": url})
+            return ExportResult(
+                method="local",
+                description="url-generated",
+                extra={"download_url": url, **self._packing_details()},
+            )
 
         return ExportResult(method=export_method, description="unsupported", extra={})
 
+    def _images_per_part(self, image_count: int, export_method: str) -> int:
+        bands_per_image = max(len(self.bands), 1)
+        per_part = max(MAX_STACK_BANDS // bands_per_image, 1)
+
+        if export_method == "local" and self.aoi is not None:
+            area = float(self.aoi.bounds().area(maxError=1).getInfo())
+            pixels = max(area / float(self.scale * self.scale), 1.0)
+            bytes_per_band = PACKING_DTYPES[self.packing_dtype][2] if self.packing_dtype else DEFAULT_BYTES_PER_BAND
+            bytes_per_image = pixels * bytes_per_band * bands_per_image
+            per_part = min(per_part, max(int(MAX_DOWNLOAD_BYTES // bytes_per_image), 1))
+
+        return min(per_part, image_count)
+
+    def _stack_parts(self, export_method: str) -> List[Tuple[List[str], object]]:
+        collection = self.image_collection.sort("system:time_start")
+        timestamps = collection.aggregate_array("system:time_start").getInfo()
+        if not timestamps:
+            return []
+
+        names = stack_band_names(timestamps, self.bands)
+        per_part = self._images_per_part(len(timestamps), export_method)
+        bands_per_image = len(self.bands)
+
+        parts = []
+        for offset in range(0, len(timestamps), per_part):
+            count = min(per_part, len(timestamps) - offset)
+            chunk = ee.ImageCollection(collection.toList(count, offset)).map(self._pack)
+            part_names = names[offset * bands_per_image : (offset + count) * bands_per_image]
+            parts.append((part_names, chunk.toBands().rename(part_names)))
+        return parts
+
+    def export_stack(
+        self,
+        export_method: str,
+        drive_folder: str,
+        file_name_prefix: str,
+        completed_parts: Optional[Dict[int, Dict[str, str]]] = None,
+        on_part: Optional[Callable[[int, Dict[str, str]], None]] = None,
+    ) -> ExportResult:
+        """Export the filtered collection as one multi-band image per part.
+
+        Each date contributes one band per selected band. The stack is split into
+        several parts only when it exceeds ``MAX_STACK_BANDS`` or, for local
+        downloads, ``MAX_DOWNLOAD_BYTES``. Parts in ``completed_parts`` whose band
+        names still match are not exported again; ``on_part`` is called after
+        each new part.
+        """
+
+        if export_method not in ("drive", "local"):
+            return ExportResult(method=export_method, description="unsupported", extra={})
+
+        parts = self._stack_parts(export_method)
+        if not parts:
+            return ExportResult(method=export_method, description="no-images", extra={})
+
+        completed_parts = completed_parts or {}
+        extra: Dict[str, str] = {"parts": str(len(parts)), **self._packing_details()}
+        for index, (names, image) in enumerate(parts, start=1):
+            # The split is recomputed on resume; a checkpoint only counts if its part
+            # still covers exactly the same bands.
+            completed = completed_parts.get(index)
+            if completed is not None and completed.get(f"part_{index}_bands") == ",".join(names):
+                extra.update(completed)
+                continue
+
+            final_prefix = f"{file_name_prefix}_stack"
+            if len(parts) > 1:
+                final_prefix = f"{final_prefix}_part{index}"
+            part_extra = {f"part_{index}_bands": ",".join(names)}
+
+            if export_method == "drive":
+                task = ee.batch.Export.image.toDrive(
+                    image=image,
+                    description=final_prefix.replace(" ", "_"),
+                    folder=drive_folder,
+                    fileNamePrefix=final_prefix,
+                    region=self.aoi.bounds() if self.aoi else None,
+                    scale=self.scale,
+                )
+                task.start()
+                part_extra[f"part_{index}_task_description"] = final_prefix
+                part_extra[f"part_{index}_task_id"] = str(task.id)
+            else:
+                part_extra[f"part_{index}_download_url"] = image.getDownloadURL(
+                    {
+                        "scale": self.scale,
+                        "crs": "EPSG:4326",
+                        "region": self.aoi.bounds().toGeoJSONString() if self.aoi else None,
+                        "filePerBand": False,
+                        "name": final_prefix,
+                    }
+                )
+
+            extra.update(part_extra)
+            if on_part is not None:
+                on_part(index, part_extra)
+
+        if export_method == "drive":
+            extra["drive_folder"] = drive_folder
+            return ExportResult(method="drive", description="task-started", extra=extra)
+        return ExportResult(method="local", description="url-generated", extra=extra)
+
 
 class CHIRPSDataExtractor(DataExtractor):
     pass
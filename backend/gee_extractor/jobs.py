@@ -0,0 +1,204 @@
+"""SQLite-backed persistence for extraction jobs and their checkpoints."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+JOB_DB_ENV = "GEE_EXTRACTOR_JOB_DB"
+
+INCOMPLETE_STATUSES = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    stage TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    config: Dict[str, Any]
+    status: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+
+
+class JobStore:
+    """Stores job configs, stage checkpoints and results in a WAL-mode SQLite file.
+
+    Writes are buffered and committed together in one transaction once
+    ``batch_size`` are pending, when a caller asks for a flush, or when a job
+    reaches a terminal status.
+
+    Each store instance is a distinct ``owner``. A job must be claimed before
+    it runs, and the claim is a lease that the owner renews while working, so
+    several processes sharing one database never run the same job at once.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 16, lease_seconds: float = 60.0):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _queue(self, sql: str, params: Tuple[Any, ...], flush: bool) -> None:
+        with self._lock:
+            self._pending.append((sql, params))
+            if flush or len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._conn.execute("BEGIN")
+        try:
+            for sql, params in pending:
+                self._conn.execute(sql, params)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def create_job(self, config: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        # The creator owns the job from the start so no other process can claim it
+        # between creation and the creator's own claim.
+        self._queue(
+            "INSERT INTO jobs (id, config, status, owner, lease_expires, created_at, updated_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, json.dumps(config), self.owner, now + self.lease_seconds, now, now),
+            flush=True,
+        )
+        return job_id
+
+    def _update_now(self, sql: str, params: Tuple[Any, ...]) -> bool:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).rowcount == 1
+
+    def claim(self, job_id: str) -> bool:
+        """Atomically take ownership of an incomplete job and mark it running.
+
+        Succeeds when the job is already ours or its previous owner's lease has
+        expired.
+        """
+
+        now = time.time()
+        placeholders = ", ".join("?" for _ in INCOMPLETE_STATUSES)
+        return self._update_now(
+            "UPDATE jobs SET status = 'running', owner = ?, lease_expires = ?, updated_at = ? "
+            f"WHERE id = ? AND status IN ({placeholders}) "
+            "AND (owner IS NULL OR owner = ? OR lease_expires IS NULL OR lease_expires < ?)",
+            (self.owner, now + self.lease_seconds, now, job_id, *INCOMPLETE_STATUSES, self.owner, now),
+        )
+
+    def renew(self, job_id: str) -> bool:
+        """Extend our lease on ``job_id``; returns ``False`` if we no longer own it."""
+
+        return self._update_now(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND owner = ?",
+            (time.time() + self.lease_seconds, job_id, self.owner),
+        )
+
+    def set_status(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self._queue(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            flush=status not in INCOMPLETE_STATUSES,
+        )
+
+    def checkpoint(self, job_id: str, stage: str, data: Dict[str, Any], flush: bool = False) -> None:
+        self._queue(
+            "INSERT OR REPLACE INTO checkpoints (job_id, stage, data, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, stage, json.dumps(data), time.time()),
+            flush=flush,
+        )
+
+    def checkpoints(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute("SELECT stage, data FROM checkpoints WHERE job_id = ?", (job_id,)).fetchall()
+        return {stage: json.loads(data) for stage, data in rows}
+
+    def _row_to_job(self, row: Tuple[Any, ...]) -> Job:
+        job_id, config, status, result, error, owner, lease_expires = row
+        return Job(
+            id=job_id,
+            config=json.loads(config),
+            status=status,
+            result=json.loads(result) if result is not None else None,
+            error=error,
+            owner=owner,
+            lease_expires=lease_expires,
+        )
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(
+                "SELECT id, config, status, result, error, owner, lease_expires FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def incomplete_jobs(self) -> List[Job]:
+        placeholders = ", ".join("?" for _ in INCOMPLETE_STATUSES)
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                "SELECT id, config, status, result, error, owner, lease_expires FROM jobs "
+                f"WHERE status IN ({placeholders}) ORDER BY created_at",
+                INCOMPLETE_STATUSES,
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
@@ -0,0 +1,125 @@
+"""Persisted record of the date ranges already exported for a configuration."""
+
+from __future__ import annotations
+
+import datetime as _dt
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:  # pragma: no cover - POSIX
+    import fcntl
+except ModuleNotFoundError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+MANIFEST_DIR_ENV = "GEE_EXTRACTOR_MANIFEST_DIR"
+DEFAULT_MANIFEST_DIR = Path.home() / ".gee_extractor" / "manifests"
+
+DateWindow = Tuple[_dt.date, _dt.date]
+
+
+def canonical_config_key(config: Dict[str, Any]) -> str:
+    """Return a stable key for ``config`` that ignores the requested dates."""
+
+    canonical = {key: value for key, value in config.items() if key != "when"}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _merge(windows: List[DateWindow]) -> List[DateWindow]:
+    merged: List[DateWindow] = []
+    for start, end in sorted(window for window in windows if window[0] < window[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` (a sidecar lock file) across processes."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ExportManifest:
+    """Tracks the ``[start, end)`` date windows exported for one configuration.
+
+    A window counts as exported once its Drive task was started or its download
+    URL generated; later task failures are not detected.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.exported: List[DateWindow] = self._load()
+
+    def _load(self) -> List[DateWindow]:
+        if not self.path.exists():
+            return []
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        return _merge([(_dt.date.fromisoformat(start), _dt.date.fromisoformat(end)) for start, end in data["exported"]])
+
+    @classmethod
+    def for_config(cls, config: Dict[str, Any], directory: Optional[Path] = None) -> "ExportManifest":
+        directory = Path(directory or os.environ.get(MANIFEST_DIR_ENV) or DEFAULT_MANIFEST_DIR)
+        return cls(directory / f"{canonical_config_key(config)}.json")
+
+    def missing(self, windows: List[DateWindow]) -> List[DateWindow]:
+        """Return the parts of ``windows`` not yet covered by the manifest."""
+
+        gaps: List[DateWindow] = []
+        for start, end in windows:
+            cursor = start
+            for done_start, done_end in self.exported:
+                if done_end <= cursor or done_start >= end:
+                    continue
+                if done_start > cursor:
+                    gaps.append((cursor, done_start))
+                cursor = max(cursor, done_end)
+                if cursor >= end:
+                    break
+            if cursor < end:
+                gaps.append((cursor, end))
+        return gaps
+
+    def record(self, windows: List[DateWindow]) -> None:
+        """Add ``windows`` to the manifest and persist it atomically.
+
+        The file is re-read under a lock, so concurrent runs sharing this
+        manifest do not drop each other's windows.
+        """
+
+        with _file_lock(self.path.with_name(f"{self.path.name}.lock")):
+            self.exported = _merge(self._load() + list(windows))
+            payload = {"exported": [[start.isoformat(), end.isoformat()] for start, end in self.exported]}
+
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, indent=2)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from .data import get_mask, get_satellite
 from .engine import ee
 from .extractor import ExportResult, Mask, DataExtractor, get_extractor
+from .jobs import INCOMPLETE_STATUSES, Job, JobStore
+from .manifest import DateWindow, ExportManifest
 
 
 @dataclass
@@ -67,7 +73,37 @@ def _prepare_mask(mask_config: Dict[str, Any]) -> Optional[Mask]:
     return Mask(mask_meta.ee_collection_name, filters=filters, band=mask_meta.default_band)
 
 
-def run_extraction(config: Dict[str, Any]) -> Dict[str, Any]:
+Checkpoint = Callable[[str, Dict[str, Any], bool], None]
+
+
+def _no_checkpoint(stage: str, data: Dict[str, Any], flush: bool) -> None:
+    return None
+
+
+def _serialize_windows(windows: List[DateWindow]) -> List[List[str]]:
+    return [[start.isoformat(), end.isoformat()] for start, end in windows]
+
+
+def _parse_windows(data: List[List[str]]) -> List[DateWindow]:
+    return [(datetime.date.fromisoformat(start), datetime.date.fromisoformat(end)) for start, end in data]
+
+
+def _format_windows(windows: List[DateWindow]) -> str:
+    return ",".join(f"{start.isoformat()}/{end.isoformat()}" for start, end in windows)
+
+
+def _exported_windows(windows: List[DateWindow], extractor: DataExtractor, sub_daily: bool) -> List[DateWindow]:
+    # Only dates up to the newest exported image count as done, so data published
+    # later for the tail of a window is picked up by the next run. For sub-daily
+    # collections the newest day may still be incomplete, so it is left out.
+    last_date = extractor.last_image_date()
+    if last_date is None:
+        return []
+    until = last_date if sub_daily else last_date + datetime.timedelta(days=1)
+    return [(start, min(end, until)) for start, end in windows if start < until]
+
+
+def _extract(config: Dict[str, Any], checkpoints: Dict[str, Dict[str, Any]], save: Checkpoint) -> Dict[str, Any]:
     _validate_config(config)
 
     satellite = get_satellite(config["satelliteId"])
@@ -87,15 +123,74 @@ def run_extraction(config: Dict[str, Any]) -> Dict[str, Any]:
         bands=config["what"]["bands"],
         scale=satellite.pixel_size,
         mask=mask_object,
+        packing=satellite.packing if config["how"].get("pack") else None,
     )
 
-    images_found = extractor.process()
     export_method = "drive" if config["how"]["type"] == "Google Drive" else "local"
-    export_result: ExportResult = extractor.export(
-        export_method=export_method,
-        drive_folder=config["settings"].get("driveFolder", ""),
-        file_name_prefix=config["how"].get("outputFilename", "gee_export"),
-    )
+    incremental = bool(config["how"].get("incremental"))
+    manifest = ExportManifest.for_config(config) if incremental else None
+
+    filtered = checkpoints.get("filtered")
+    if filtered is not None:
+        windows = _parse_windows(filtered["windows"])
+    else:
+        windows = extractor.date_windows()
+        if manifest is not None:
+            windows = manifest.missing(windows)
+
+    exported = checkpoints.get("exported")
+    if exported is not None:
+        images_found = int(exported["images_found"])
+        export_result = ExportResult(**exported["result"])
+        recorded = _parse_windows(exported["windows"])
+    elif not windows:
+        images_found = 0
+        export_result = ExportResult(method=export_method, description="up-to-date", extra={})
+        recorded = []
+    else:
+        images_found = extractor.process(windows)
+        # The filtered windows can be recomputed if lost, so this checkpoint is only
+        # queued and commits together with the first durable write that follows.
+        save("filtered", {"windows": _serialize_windows(windows), "images_found": images_found}, False)
+
+        file_name_prefix = config["how"].get("outputFilename", "gee_export")
+        if incremental:
+            file_name_prefix = f"{file_name_prefix}_{windows[0][0].strftime('%Y%m%d')}"
+        export_kwargs = {
+            "export_method": export_method,
+            "drive_folder": config["settings"].get("driveFolder", ""),
+            "file_name_prefix": file_name_prefix,
+        }
+        # Incremental runs always stack so every image in the missing windows is exported.
+        stacked = incremental or bool(config["how"].get("stack"))
+        if stacked:
+            export_result = extractor.export_stack(
+                completed_parts={
+                    int(stage[len("part_"):]): data for stage, data in checkpoints.items() if stage.startswith("part_")
+                },
+                # A part records a started task or generated URL, so it must be durable
+                # before the next part is exported.
+                on_part=lambda index, data: save(f"part_{index}", data, True),
+                **export_kwargs,
+            )
+        else:
+            export_result = extractor.export(**export_kwargs)
+
+        exported_ok = export_result.description in ("task-started", "url-generated")
+        recorded = []
+        if manifest is not None and exported_ok:
+            recorded = _exported_windows(windows, extractor, satellite.sub_daily)
+        # Stack parts are already durable; a single export's task is recorded only
+        # here, so that checkpoint must be flushed straight away.
+        save(
+            "exported",
+            {"images_found": images_found, "result": asdict(export_result), "windows": _serialize_windows(recorded)},
+            not stacked,
+        )
+
+    if manifest is not None and recorded:
+        manifest.record(recorded)
+        export_result.extra["exported_windows"] = _format_windows(recorded)
 
     summary = RunSummary(
         status="success",
@@ -108,3 +203,89 @@ def run_extraction(config: Dict[str, Any]) -> Dict[str, Any]:
     )
 
     return {"status": summary.status, "summary": summary.__dict__}
+
+
+@contextmanager
+def _lease_heartbeat(job_store: JobStore, job_id: str) -> Iterator[None]:
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(job_store.lease_seconds / 3):
+            job_store.renew(job_id)
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_extraction(
+    config: Dict[str, Any],
+    job_store: Optional[JobStore] = None,
+    job_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run an extraction, persisting its progress in ``job_store`` when given.
+
+    Passing the ``job_id`` of an existing job resumes it from its last
+    checkpoint instead of filtering and exporting everything again. The job
+    must be claimable by ``job_store``; a job leased by another live process
+    raises ``RuntimeError``.
+    """
+
+    if job_store is None:
+        return _extract(config, {}, _no_checkpoint)
+
+    if job_id is None:
+        job_id = job_store.create_job(config)
+    if not job_store.claim(job_id):
+        raise RuntimeError(f"Job {job_id} is not claimable; it is finished or owned by another process")
+    checkpoints = job_store.checkpoints(job_id)
+
+    def save(stage: str, data: Dict[str, Any], flush: bool) -> None:
+        job_store.checkpoint(job_id, stage, data, flush=flush)
+
+    with _lease_heartbeat(job_store, job_id):
+        try:
+            result = _extract(config, checkpoints, save)
+        except Exception as exc:
+            job_store.set_status(job_id, "failed", error=str(exc))
+            raise
+
+    result["job_id"] = job_id
+    job_store.set_status(job_id, "completed", result=result)
+    return result
+
+
+def _claim_for_resume(job_store: JobStore, job: Job) -> bool:
+    if job_store.claim(job.id):
+        return True
+    # Wait out the previous owner's lease once; a live owner keeps renewing it.
+    current = job_store.get_job(job.id)
+    if current is None or current.status not in INCOMPLETE_STATUSES or current.lease_expires is None:
+        return False
+    delay = current.lease_expires - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    return job_store.claim(job.id)
+
+
+def resume_incomplete_jobs(job_store: JobStore, jobs: Optional[List[Job]] = None) -> List[str]:
+    """Resume queued or running jobs left behind by a previous process.
+
+    ``jobs`` defaults to every incomplete job currently in ``job_store``. Jobs
+    still leased by a live process are left to it.
+    """
+
+    resumed: List[str] = []
+    for job in job_store.incomplete_jobs() if jobs is None else jobs:
+        if not _claim_for_resume(job_store, job):
+            continue
+        try:
+            run_extraction(job.config, job_store, job.id)
+        except Exception:  # the failure is recorded on the job itself
+            continue
+        resumed.append(job.id)
+    return resumed
@@ -0,0 +1,294 @@
+"""Concurrent load generator for the ``/api/run-extraction`` endpoint.
+
+Run ``python backend/loadtest.py --help`` for options. Without ``--url`` the
+requests go to an in-process app, which uses the Earth Engine stub when the
+``ee`` package is not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from gee_extractor.data import MASKS, SATELLITES
+
+ENDPOINT = "/api/run-extraction"
+
+# Filters applied when a request in the mix enables the cropland mask.
+MASK_FILTERS = {"ESA_WORLDCEREAL_V100": {"product": "temporarycrops", "season": "tc-annual"}}
+
+Sender = Callable[[Dict[str, Any]], int]
+
+
+def is_success(status: int) -> bool:
+    return 0 < status < 400
+
+
+def is_expected_rejection(status: int, request_class: str) -> bool:
+    """Whether a failure is the runner's known 400 for unsupported region AOIs."""
+
+    return status == 400 and request_class.startswith("region/")
+
+
+def request_class(config: Dict[str, Any]) -> str:
+    """Label a config by AOI kind and masking, e.g. ``point/masked``."""
+
+    aoi = "point" if config["where"]["type"] == "Point" else "region"
+    mask = "masked" if config["mask"]["enabled"] else "unmasked"
+    return f"{aoi}/{mask}"
+
+
+@dataclass
+class LoadTestReport:
+    """Results of a load test.
+
+    Latency percentiles only cover successful responses, so fast rejections
+    such as the 400s for region AOIs do not make saturation look better.
+    """
+
+    requests: int
+    errors: int
+    duration: float
+    latencies: List[float]
+    statuses: List[int]
+    classes: List[str]
+    status_counts: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def unexpected_errors(self) -> int:
+        """Errors other than the known rejections of region requests."""
+
+        return sum(
+            1
+            for status, cls in zip(self.statuses, self.classes)
+            if not is_success(status) and not is_expected_rejection(status, cls)
+        )
+
+    def successful_latencies(self, request_class: Optional[str] = None) -> List[float]:
+        return sorted(
+            latency
+            for latency, status, cls in zip(self.latencies, self.statuses, self.classes)
+            if is_success(status) and (request_class is None or cls == request_class)
+        )
+
+    def percentile(self, pct: float, request_class: Optional[str] = None) -> float:
+        return percentile(self.successful_latencies(request_class), pct)
+
+    def _latency_line(self, request_class: Optional[str] = None) -> str:
+        return (
+            f"p50 {self.percentile(50, request_class) * 1000:.1f} ms, "
+            f"p95 {self.percentile(95, request_class) * 1000:.1f} ms, "
+            f"p99 {self.percentile(99, request_class) * 1000:.1f} ms"
+        )
+
+    def format(self) -> str:
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.status_counts.items()))
+        lines = [
+            f"requests:   {self.requests} in {self.duration:.2f}s",
+            f"throughput: {self.throughput:.1f} req/s",
+            f"latency:    {self._latency_line()} (successful responses)",
+            f"errors:     {self.errors} ({self.error_rate:.1%}), {self.unexpected_errors} unexpected",
+            f"statuses:   {statuses}",
+        ]
+        for cls in sorted(set(self.classes)):
+            total = self.classes.count(cls)
+            ok = len(self.successful_latencies(cls))
+            latency = self._latency_line(cls) if ok else "no successful responses"
+            lines.append(f"  {cls}: {ok}/{total} ok, {latency}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank ``pct`` percentile of ``sorted_values``."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_configs(
+    satellite_ids: Sequence[str],
+    mask_fraction: float = 0.0,
+    region_fraction: float = 0.0,
+    seed: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield an endless, reproducible mix of extraction configs.
+
+    Region requests use a GADM shape AOI, which the runner currently rejects
+    with a 400. They show up in the error rate but not in the exit status.
+    """
+
+    rng = random.Random(seed)
+    mask_id = next(iter(MASKS))
+    while True:
+        satellite = SATELLITES[rng.choice(list(satellite_ids))]
+        masked = rng.random() < mask_fraction
+        region = rng.random() < region_fraction
+        yield {
+            "satelliteId": satellite.id,
+            "where": {
+                "type": "GADM Shape" if region else "Point",
+                "point": {"lat": f"{rng.uniform(-50, 60):.4f}", "lon": f"{rng.uniform(-120, 150):.4f}"},
+                "pointsFile": None,
+                "gadm": {"country": "KEN" if region else "", "region": "", "subregion": ""},
+                "personalShapeFile": None,
+            },
+            "when": {"startYear": 2020, "endYear": 2020, "startDoy": 1, "endDoy": 16},
+            "what": {"bands": list(satellite.default_bands)},
+            "how": {"type": "Google Drive", "localPath": "", "outputFilename": "loadtest"},
+            "settings": {"geeProject": "loadtest", "driveFolder": "GEE_LOADTEST"},
+            "mask": {
+                "enabled": masked,
+                "maskId": mask_id if masked else None,
+                "filters": dict(MASK_FILTERS.get(mask_id, {})) if masked else {},
+            },
+        }
+
+
+def in_process_sender() -> Sender:
+    """Send requests to an app created in this process, one test client per thread."""
+
+    from app import create_app
+
+    app = create_app(resume_jobs=False)
+    local = threading.local()
+
+    def send(config: Dict[str, Any]) -> int:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        return client.post(ENDPOINT, json=config).status_code
+
+    return send
+
+
+def http_sender(base_url: str, timeout: float = 60.0) -> Sender:
+    """Send requests over HTTP to a running backend at ``base_url``."""
+
+    url = base_url.rstrip("/") + ENDPOINT
+
+    def send(config: Dict[str, Any]) -> int:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(config).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+    return send
+
+
+def run_load_test(
+    send: Sender,
+    configs: Iterator[Dict[str, Any]],
+    total_requests: int,
+    concurrency: int,
+    rate: Optional[float] = None,
+) -> LoadTestReport:
+    """Issue ``total_requests`` through ``concurrency`` workers and time them.
+
+    With ``rate`` set, requests are scheduled at that many per second and
+    latency is measured from the scheduled time, so queueing behind busy
+    workers counts against the backend. Otherwise each worker sends its next
+    request as soon as the previous one finishes.
+    """
+
+    payloads = [next(configs) for _ in range(total_requests)]
+    latencies: List[float] = [0.0] * total_requests
+    statuses: List[int] = [0] * total_requests
+    start = time.perf_counter()
+
+    def issue(index: int) -> None:
+        scheduled = start + index / rate if rate else None
+        if scheduled is not None:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        began = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            statuses[index] = send(payloads[index])
+        except Exception:  # count client-side failures as errors
+            statuses[index] = 0
+        latencies[index] = time.perf_counter() - began
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(issue, range(total_requests)))
+
+    duration = time.perf_counter() - start
+    status_counts: Dict[int, int] = {}
+    for status in statuses:
+        status_counts[status] = status_counts.get(status, 0) + 1
+    errors = sum(count for status, count in status_counts.items() if not is_success(status))
+    return LoadTestReport(
+        requests=total_requests,
+        errors=errors,
+        duration=duration,
+        latencies=latencies,
+        statuses=statuses,
+        classes=[request_class(payload) for payload in payloads],
+        status_counts=status_counts,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running backend; omit to run the app in-process.")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests to send.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent workers.")
+    parser.add_argument("--rate", type=float, help="Arrival rate in requests per second (default: closed loop).")
+    parser.add_argument(
+        "--satellites",
+        default=",".join(SATELLITES),
+        help="Comma-separated satellite ids to draw from.",
+    )
+    parser.add_argument("--mask-fraction", type=float, default=0.0, help="Share of requests with a mask enabled.")
+    parser.add_argument(
+        "--region-fraction",
+        type=float,
+        default=0.0,
+        help="Share of requests with a region (GADM) AOI instead of a point.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible config mix.")
+    args = parser.parse_args(argv)
+
+    satellite_ids = [satellite_id.strip() for satellite_id in args.satellites.split(",") if satellite_id.strip()]
+    unknown = [satellite_id for satellite_id in satellite_ids if satellite_id not in SATELLITES]
+    if unknown:
+        parser.error(f"Unknown satellite ids: {', '.join(unknown)}")
+
+    send = http_sender(args.url) if args.url else in_process_sender()
+    configs = build_configs(satellite_ids, args.mask_fraction, args.region_fraction, args.seed)
+    report = run_load_test(send, configs, args.requests, args.concurrency, args.rate)
+    print(report.format())
+    return 0 if report.unexpected_errors == 0 else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
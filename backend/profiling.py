@@ -0,0 +1,101 @@
+"""Opt-in cProfile capture for extraction requests."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROFILE_DIR_ENV = "GEE_EXTRACTOR_PROFILE_DIR"
+PROFILE_SAMPLE_RATE_ENV = "GEE_EXTRACTOR_PROFILE_SAMPLE_RATE"
+PROFILE_HEADER = "X-Profile"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+PROFILE_NAME = re.compile(r"^[A-Za-z0-9_.-]+\.prof$")
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9.-]+")
+
+
+def _safe(value: Optional[str]) -> str:
+    return _UNSAFE_CHARS.sub("-", value or "unknown").strip("-")[:64] or "unknown"
+
+
+class RequestProfiler:
+    """Profiles selected requests and writes one ``.prof`` file per request.
+
+    Profiling is off unless ``directory`` is set. A request is then profiled
+    when it sends ``X-Profile: 1`` or is picked by ``sample_rate``. Only one
+    request is profiled at a time, since a profiler observes the whole process.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, sample_rate: float = 0.0):
+        self.directory = Path(directory) if directory else None
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        directory = os.environ.get(PROFILE_DIR_ENV)
+        sample_rate = float(os.environ.get(PROFILE_SAMPLE_RATE_ENV) or 0.0)
+        return cls(Path(directory) if directory else None, sample_rate)
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def should_profile(self, header_value: Optional[str]) -> bool:
+        if self.directory is None:
+            return False
+        if header_value and header_value.lower() in ("1", "true", "yes"):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, func: Callable[[], Any], request_id: str, label: Optional[str]) -> Tuple[Any, Optional[str]]:
+        """Call ``func`` under cProfile and return its result and the profile name.
+
+        The profile is written even when ``func`` raises. If another request is
+        already being profiled, ``func`` runs unprofiled and the name is ``None``.
+        """
+
+        if self.directory is None or not self._lock.acquire(blocking=False):
+            return func(), None
+
+        name = f"{int(time.time() * 1000)}_{_safe(request_id)}_{_safe(label)}.prof"
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func), name
+        finally:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(str(self.directory / name))
+            finally:
+                self._lock.release()
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.prof"), reverse=True):
+            stat = path.stat()
+            profiles.append({"name": path.name, "size": stat.st_size, "created": stat.st_mtime})
+        return profiles
+
+    def render(self, name: str, limit: int = 50) -> Optional[str]:
+        """Return the top ``limit`` functions by cumulative time, or ``None``."""
+
+        if self.directory is None or not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        if not path.is_file():
+            return None
+
+        output = io.StringIO()
+        stats = pstats.Stats(str(path), stream=output)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
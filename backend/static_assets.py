@@ -0,0 +1,136 @@
+"""In-memory table of the built frontend with precompressed variants."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:  # pragma: no cover - brotli is optional
+    import brotli
+except ModuleNotFoundError:  # pragma: no cover - serve gzip only
+    brotli = None
+
+# Vite's ``build.assetsDir``: everything in it has a content hash in its name.
+ASSETS_PREFIX = "assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/wasm")
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Asset:
+    body: bytes
+    content_type: str
+    etag: str
+    cache_control: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+
+def _compress(body: bytes) -> Dict[str, bytes]:
+    encoded: Dict[str, bytes] = {}
+    if brotli is not None:
+        candidate = brotli.compress(body, quality=11)
+        if len(candidate) < len(body):
+            encoded["br"] = candidate
+    candidate = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(candidate) < len(body):
+        encoded["gzip"] = candidate
+    return encoded
+
+
+def _load_asset(path: Path, relative: str) -> Asset:
+    body = path.read_bytes()
+    content_type = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type = f"{content_type}; charset=utf-8"
+
+    encoded: Dict[str, bytes] = {}
+    if len(body) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+        encoded = _compress(body)
+
+    return Asset(
+        body=body,
+        content_type=content_type,
+        etag=hashlib.sha256(body).hexdigest()[:32],
+        cache_control=IMMUTABLE_CACHE_CONTROL if relative.startswith(ASSETS_PREFIX) else REVALIDATE_CACHE_CONTROL,
+        encoded=encoded,
+    )
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class AssetTable:
+    """Files under ``root`` loaded once, keyed by their URL path."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.assets: Dict[str, Asset] = {}
+        if self.root.is_dir():
+            for path in sorted(self.root.rglob("*")):
+                if path.is_file():
+                    relative = path.relative_to(self.root).as_posix()
+                    self.assets[relative] = _load_asset(path, relative)
+
+    @property
+    def index(self) -> Optional[Asset]:
+        return self.assets.get("index.html")
+
+    def resolve(self, path: str) -> Optional[Asset]:
+        """Return the asset for ``path``, falling back to ``index.html``.
+
+        Missing files under ``assets/`` return ``None`` rather than the index,
+        since a stale hashed URL must not be answered with HTML.
+        """
+
+        path = path.lstrip("/")
+        asset = self.assets.get(path)
+        if asset is None and not path.startswith(ASSETS_PREFIX):
+            asset = self.index
+        return asset
+
+    @staticmethod
+    def respond(asset: Asset, if_none_match: str = "", accept_encoding: str = "") -> Tuple[bytes, int, Dict[str, str]]:
+        """Return ``(body, status, headers)`` for serving ``asset``."""
+
+        accepted = _accepted_encodings(accept_encoding)
+        encoding = next(
+            (name for name in ("br", "gzip") if name in asset.encoded and accepted.get(name, 0.0) > 0),
+            None,
+        )
+        # Each encoded representation gets its own strong validator.
+        etag = f'"{asset.etag}-{encoding}"' if encoding else f'"{asset.etag}"'
+
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if asset.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return b"", 304, headers
+
+        headers["Content-Type"] = asset.content_type
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return (asset.encoded[encoding] if encoding else asset.body), 200, headers
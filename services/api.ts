@@ -14,6 +14,7 @@ export interface RunExtractionResponse {
     export_details: Record<string, string>;
   };
   message?: string;
+  job_id?: string;
 }
 
 export async function runExtraction(config: Configuration): Promise<RunExtractionResponse> {
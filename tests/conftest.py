@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent
 PROJECT_ROOT = ROOT.parent
 if str(PROJECT_ROOT) not in sys.path:
@@ -8,3 +10,25 @@ if str(PROJECT_ROOT) not in sys.path:
 BACKEND_DIR = PROJECT_ROOT / 'backend'
 if BACKEND_DIR.exists() and str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def extraction_config():
+    """A minimal CHIRPS point extraction config, fresh for each test."""
+
+    return {
+        "satelliteId": "CHIRPS_DAILY",
+        "where": {
+            "type": "Point",
+            "point": {"lat": "10.0", "lon": "-84.0"},
+            "pointsFile": None,
+            "gadm": {"country": "", "region": "", "subregion": ""},
+            "personalShapeFile": None,
+        },
+        "when": {"startYear": 2020, "endYear": 2020, "startDoy": 1, "endDoy": 2},
+        "what": {"bands": ["precipitation"]},
+        "how": {"type": "Google Drive", "localPath": "", "outputFilename": "chirps_test"},
+        "settings": {"geeProject": "test-project", "driveFolder": "GEE_TESTS"},
+        "mask": {"enabled": False, "maskId": None, "filters": {}},
+    }
+
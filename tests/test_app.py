@@ -1,6 +1,7 @@
 import pytest
 
 from app import create_app
+from backend.profiling import RequestProfiler
 
 
 def test_run_extraction_endpoint():
@@ -55,3 +56,85 @@ def test_run_extraction_endpoint_validation_error():
     data = response.get_json()
     assert data["status"] == "error"
     assert "validation" in data["message"].lower()
+
+
+def make_dist(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html>" + "x" * 1000 + "</html>")
+    (tmp_path / "assets" / "index-Bx7d9K2a.js").write_text("console.log('hi');" * 100)
+    (tmp_path / "assets" / "index-B-7d9K2a.css").write_text("body{}")
+    (tmp_path / "site-webmanifest.json").write_text("{}")
+    return tmp_path
+
+
+def test_static_assets_served_from_memory_with_etags(tmp_path):
+    client = create_app(dist_dir=make_dist(tmp_path)).test_client()
+    (tmp_path / "assets" / "index-Bx7d9K2a.js").unlink()
+
+    response = client.get("/assets/index-Bx7d9K2a.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+    cached = client.get(
+        "/assets/index-Bx7d9K2a.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+
+def test_unknown_paths_fall_back_to_revalidated_index(tmp_path):
+    client = create_app(dist_dir=make_dist(tmp_path)).test_client()
+
+    response = client.get("/some/client/route")
+    assert response.status_code == 200
+    assert response.data.startswith(b"<html>")
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Content-Encoding" not in response.headers
+
+
+def test_profiled_request_writes_profile_viewable_by_admin(tmp_path, monkeypatch, extraction_config):
+    monkeypatch.setenv("GEE_EXTRACTOR_ADMIN_TOKEN", "secret")
+    client = create_app(profiler=RequestProfiler(tmp_path / "profiles")).test_client()
+
+    response = client.post(
+        "/api/run-extraction",
+        json=extraction_config,
+        headers={"X-Profile": "1", "X-Request-ID": "req42"},
+    )
+    assert response.status_code == 200
+    name = response.headers["X-Profile-Name"]
+    assert name.endswith("_req42_CHIRPS-DAILY.prof")
+    assert (tmp_path / "profiles" / name).is_file()
+
+    assert client.get("/api/admin/profiles").status_code == 404
+    listing = client.get("/api/admin/profiles", headers={"X-Admin-Token": "secret"})
+    assert [profile["name"] for profile in listing.get_json()["profiles"]] == [name]
+
+    report = client.get(f"/api/admin/profiles/{name}", headers={"X-Admin-Token": "secret"})
+    assert report.status_code == 200
+    assert "run_extraction" in report.get_data(as_text=True)
+
+
+def test_requests_are_not_profiled_by_default(tmp_path, extraction_config):
+    client = create_app(profiler=RequestProfiler(None)).test_client()
+    response = client.post("/api/run-extraction", json=extraction_config, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "X-Profile-Name" not in response.headers
+
+
+def test_only_vite_assets_dir_is_immutable(tmp_path):
+    client = create_app(dist_dir=make_dist(tmp_path)).test_client()
+
+    hashed = client.get("/assets/index-B-7d9K2a.css")
+    assert hashed.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+    public = client.get("/site-webmanifest.json")
+    assert public.headers["Cache-Control"] == "no-cache"
+    assert public.headers["Content-Type"].startswith("application/")
+
+
+def test_missing_asset_returns_404(tmp_path):
+    client = create_app(dist_dir=make_dist(tmp_path)).test_client()
+    assert client.get("/assets/index-OLDHASH1.js").status_code == 404
@@ -0,0 +1,128 @@
+import datetime as dt
+import json
+from collections import OrderedDict
+
+import pytest
+
+from gee_extractor import extractor
+from gee_extractor.engine import ee
+
+
+@pytest.fixture(autouse=True)
+def empty_mask_cache(monkeypatch):
+    monkeypatch.setattr(extractor, "_MASK_CACHE", OrderedDict())
+
+
+def _ms(*args):
+    return dt.datetime(*args, tzinfo=dt.timezone.utc).timestamp() * 1000
+
+
+def make_extractor(bands=("precipitation",)):
+    data_extractor = extractor.DataExtractor(
+        collection_name="UCSB-CHG/CHIRPS/DAILY",
+        start_year=2020,
+        end_year=2020,
+        start_doy=1,
+        end_doy=3,
+        aoi=ee.Geometry.Point([-84.0, 10.0]),
+        bands=list(bands),
+        scale=5566,
+    )
+    data_extractor.process()
+    return data_extractor
+
+
+def test_stack_band_names_are_band_and_date():
+    names = extractor.stack_band_names([_ms(2020, 1, 1), _ms(2020, 1, 2)], ["NDVI", "EVI"])
+    assert names == ["NDVI_20200101", "EVI_20200101", "NDVI_20200102", "EVI_20200102"]
+
+
+def test_stack_band_names_include_time_for_subdaily_images():
+    names = extractor.stack_band_names([_ms(2020, 1, 1, 0), _ms(2020, 1, 1, 1)], ["temperature_2m"])
+    assert names == ["temperature_2m_20200101T0000", "temperature_2m_20200101T0100"]
+
+
+def test_export_stack_splits_when_band_limit_exceeded(monkeypatch):
+    monkeypatch.setattr(extractor, "MAX_STACK_BANDS", 1)
+    result = make_extractor().export_stack("drive", "GEE_TESTS", "chirps")
+    assert result.extra["parts"] == "2"
+    assert result.extra["part_1_task_description"] == "chirps_stack_part1"
+    assert result.extra["part_2_task_description"] == "chirps_stack_part2"
+    assert "," not in result.extra["part_1_bands"]
+
+
+def test_mask_prepare_filters_to_aoi_bounds_and_is_cached(monkeypatch):
+    aoi = ee.Geometry.Point([-84.0, 10.0])
+    filters = {"product": "temporarycrops", "season": "tc-annual"}
+    mask = extractor.Mask("ESA/WorldCereal/2021/MODELS/v100", filters=filters, band="classification")
+
+    built = []
+
+    class RecordingCollection(ee.ImageCollection):
+        def __init__(self, items):
+            super().__init__(items)
+            built.append(self)
+
+    monkeypatch.setattr(ee, "ImageCollection", RecordingCollection)
+    image = mask.prepare(aoi)
+    assert image.name == "mosaic_ESA/WorldCereal/2021/MODELS/v100"
+    assert len(built) == 1
+    assert built[0].bounds_filter.coords == aoi.bounds().coords
+    assert [(f.key, f.value) for f in built[0].filters] == list(filters.items())
+
+    other = extractor.Mask("ESA/WorldCereal/2021/MODELS/v100", filters=dict(filters), band="classification")
+    assert other.prepare(ee.Geometry.Point([-84.0, 10.0])) is image
+    assert other.prepare(ee.Geometry.Point([5.0, 45.0])) is not image
+    assert len(built) == 2
+
+
+def test_common_packing_dtype_widens_mixed_signedness():
+    assert extractor.common_packing_dtype(["int16", "int16"]) == "int16"
+    assert extractor.common_packing_dtype(["int16", "uint16"]) == "int32"
+    assert extractor.common_packing_dtype(["uint8", "uint16"]) == "uint16"
+
+
+def test_packing_skipped_when_a_band_has_no_metadata():
+    packing = {"precipitation": extractor.BandPacking(scale=0.1, offset=0.0, dtype="uint16", nodata=65535)}
+    data_extractor = extractor.DataExtractor(
+        collection_name="UCSB-CHG/CHIRPS/DAILY",
+        start_year=2020,
+        end_year=2020,
+        start_doy=1,
+        end_doy=3,
+        aoi=ee.Geometry.Point([-84.0, 10.0]),
+        bands=["precipitation", "other"],
+        scale=5566,
+        packing=packing,
+    )
+    assert data_extractor.packing == {}
+    assert data_extractor.packing_dtype is None
+
+
+def test_export_stack_reexports_completed_part_with_different_bands():
+    completed = {1: {"part_1_bands": "precipitation_20191231", "part_1_task_id": "STALE"}}
+    exported = []
+    result = make_extractor().export_stack(
+        "drive", "GEE_TESTS", "chirps", completed_parts=completed, on_part=lambda index, data: exported.append(index)
+    )
+    assert exported == [1]
+    assert result.extra["part_1_task_id"] != "STALE"
+
+
+def test_export_stack_skips_completed_part_with_matching_bands():
+    data_extractor = make_extractor()
+    timestamps = data_extractor.image_collection.aggregate_array("system:time_start").getInfo()
+    bands = ",".join(extractor.stack_band_names(timestamps, ["precipitation"]))
+    completed = {1: {"part_1_bands": bands, "part_1_task_id": "DONE"}}
+    exported = []
+    result = data_extractor.export_stack(
+        "drive", "GEE_TESTS", "chirps", completed_parts=completed, on_part=lambda index, data: exported.append(index)
+    )
+    assert exported == []
+    assert result.extra["part_1_task_id"] == "DONE"
+
+
+def test_geojson_bounds_covers_every_vertex():
+    polygon = json.dumps({"type": "Polygon", "coordinates": [[[0, 0], [4, 1], [2, 5], [0, 0]]]})
+    assert extractor.geojson_bounds(polygon) == (0, 0, 4, 5)
+    assert extractor.geojson_bounds(ee.Geometry.Point([-84.0, 10.0]).toGeoJSONString()) == (-84.0, 10.0, -84.0, 10.0)
@@ -0,0 +1,130 @@
+import sqlite3
+
+from gee_extractor import extractor, runner
+from gee_extractor.engine import ee
+from gee_extractor.jobs import JobStore
+
+
+def test_job_store_uses_wal_and_batches_checkpoints(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    store = JobStore(db_path, batch_size=3)
+    observer = sqlite3.connect(str(db_path))
+    assert observer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def visible_checkpoints():
+        return observer.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+    job_id = store.create_job({"satelliteId": "CHIRPS_DAILY"})
+    store.checkpoint(job_id, "part_1", {"part_1_task_id": "A"})
+    store.checkpoint(job_id, "part_2", {"part_2_task_id": "B"})
+    assert visible_checkpoints() == 0
+
+    store.flush()
+    assert visible_checkpoints() == 2
+    assert set(store.checkpoints(job_id)) == {"part_1", "part_2"}
+    observer.close()
+
+
+def test_run_extraction_records_completed_job(tmp_path, extraction_config):
+    store = JobStore(tmp_path / "jobs.db")
+    result = runner.run_extraction(extraction_config, job_store=store)
+
+    job = store.get_job(result["job_id"])
+    assert job.status == "completed"
+    assert job.result["summary"]["images_found"] == result["summary"]["images_found"]
+    assert store.incomplete_jobs() == []
+
+
+def test_resume_skips_parts_already_exported(tmp_path, monkeypatch, extraction_config):
+    monkeypatch.setattr(extractor, "MAX_STACK_BANDS", 1)
+    config = extraction_config
+    config["how"]["stack"] = True
+    # A crashed process whose lease has already run out.
+    store = JobStore(tmp_path / "jobs.db", lease_seconds=0)
+    job_id = store.create_job(config)
+    assert store.claim(job_id)
+    store.checkpoint(job_id, "part_1", {"part_1_bands": "precipitation_20200101", "part_1_task_id": "EXISTING"})
+    store.close()
+
+    reopened = JobStore(tmp_path / "jobs.db")
+    assert runner.resume_incomplete_jobs(reopened) == [job_id]
+
+    job = reopened.get_job(job_id)
+    assert job.status == "completed"
+    assert job.result["summary"]["export_details"]["part_1_task_id"] == "EXISTING"
+
+
+def test_part_checkpoints_are_durable_before_next_part(tmp_path, monkeypatch, extraction_config):
+    monkeypatch.setattr(extractor, "MAX_STACK_BANDS", 1)
+    db_path = tmp_path / "jobs.db"
+    visible_parts = []
+    to_drive = ee.batch.Export.image.toDrive
+
+    def observe_checkpoints(**kwargs):
+        with sqlite3.connect(str(db_path)) as conn:
+            rows = conn.execute("SELECT stage FROM checkpoints WHERE stage LIKE 'part_%'").fetchall()
+        visible_parts.append(sorted(stage for (stage,) in rows))
+        return to_drive(**kwargs)
+
+    monkeypatch.setattr(ee.batch.Export.image, "toDrive", staticmethod(observe_checkpoints))
+    config = extraction_config
+    config["how"]["stack"] = True
+    runner.run_extraction(config, job_store=JobStore(db_path))
+
+    assert visible_parts == [[], ["part_1"]]
+
+
+def test_filtered_checkpoint_commits_with_first_part(tmp_path, monkeypatch, extraction_config):
+    monkeypatch.setattr(extractor, "MAX_STACK_BANDS", 1)
+    db_path = tmp_path / "jobs.db"
+    visible_stages = []
+    to_drive = ee.batch.Export.image.toDrive
+
+    def observe_checkpoints(**kwargs):
+        with sqlite3.connect(str(db_path)) as conn:
+            rows = conn.execute("SELECT stage FROM checkpoints").fetchall()
+        visible_stages.append(sorted(stage for (stage,) in rows))
+        return to_drive(**kwargs)
+
+    monkeypatch.setattr(ee.batch.Export.image, "toDrive", staticmethod(observe_checkpoints))
+    config = extraction_config
+    config["how"]["stack"] = True
+    runner.run_extraction(config, job_store=JobStore(db_path))
+
+    # Nothing is committed before part 1 starts; part 1's flush carries the
+    # queued filtered checkpoint with it.
+    assert visible_stages == [[], ["filtered", "part_1"]]
+
+
+def test_claim_is_exclusive_while_lease_is_live(tmp_path):
+    first = JobStore(tmp_path / "jobs.db")
+    second = JobStore(tmp_path / "jobs.db")
+    job_id = first.create_job({"satelliteId": "CHIRPS_DAILY"})
+
+    assert first.claim(job_id)
+    assert not second.claim(job_id)
+    assert first.renew(job_id)
+    assert not second.renew(job_id)
+
+
+def test_claim_succeeds_after_lease_expires(tmp_path):
+    crashed = JobStore(tmp_path / "jobs.db", lease_seconds=0)
+    job_id = crashed.create_job({"satelliteId": "CHIRPS_DAILY"})
+    assert crashed.claim(job_id)
+
+    restarted = JobStore(tmp_path / "jobs.db")
+    assert restarted.claim(job_id)
+    assert restarted.get_job(job_id).owner == restarted.owner
+    assert not crashed.renew(job_id)
+
+
+def test_resume_leaves_jobs_leased_by_live_process(tmp_path, monkeypatch, extraction_config):
+    live = JobStore(tmp_path / "jobs.db")
+    job_id = live.create_job(extraction_config)
+    assert live.claim(job_id)
+
+    other = JobStore(tmp_path / "jobs.db")
+    # Simulate the live owner renewing its lease while the other process waits.
+    monkeypatch.setattr(runner.time, "sleep", lambda delay: live.renew(job_id))
+    assert runner.resume_incomplete_jobs(other) == []
+    assert other.get_job(job_id).owner == live.owner
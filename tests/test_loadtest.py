@@ -0,0 +1,57 @@
+import itertools
+
+import loadtest
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert loadtest.percentile(values, 50) == 50.0
+    assert loadtest.percentile(values, 99) == 99.0
+    assert loadtest.percentile([], 99) == 0.0
+
+
+def test_build_configs_mixes_masks_and_regions():
+    configs = list(itertools.islice(loadtest.build_configs(["CHIRPS_DAILY"], 1.0, 1.0, seed=0), 3))
+    assert all(config["mask"]["enabled"] for config in configs)
+    assert all(config["where"]["type"] == "GADM Shape" for config in configs)
+
+
+def test_run_load_test_in_process_reports_latencies():
+    configs = loadtest.build_configs(["CHIRPS_DAILY", "MODIS_MOD13Q1_061"], mask_fraction=0.5, seed=1)
+    report = loadtest.run_load_test(loadtest.in_process_sender(), configs, total_requests=20, concurrency=4)
+    assert report.requests == 20
+    assert report.errors == 0
+    assert report.status_counts == {200: 20}
+    assert report.percentile(50) <= report.percentile(99)
+
+
+def test_percentiles_exclude_failed_requests():
+    report = loadtest.LoadTestReport(
+        requests=3,
+        errors=1,
+        duration=1.0,
+        latencies=[0.5, 0.7, 0.001],
+        statuses=[200, 200, 400],
+        classes=["point/unmasked", "point/masked", "region/unmasked"],
+    )
+    assert report.percentile(50) == 0.5
+    assert report.percentile(99) == 0.7
+    assert report.percentile(99, "point/masked") == 0.7
+    assert report.percentile(99, "region/unmasked") == 0.0
+    assert "region/unmasked: 0/1 ok" in report.format()
+
+
+def test_region_rejections_do_not_fail_the_run(capsys):
+    report = loadtest.LoadTestReport(
+        requests=3,
+        errors=2,
+        duration=1.0,
+        latencies=[0.5, 0.001, 0.001],
+        statuses=[200, 400, 500],
+        classes=["point/unmasked", "region/unmasked", "region/masked"],
+    )
+    assert report.unexpected_errors == 1
+
+    argv = ["--requests", "4", "--satellites", "CHIRPS_DAILY", "--region-fraction", "1.0", "--seed", "0"]
+    assert loadtest.main(argv) == 0
+    assert "4 (100.0%), 0 unexpected" in capsys.readouterr().out
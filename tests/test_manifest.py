@@ -0,0 +1,41 @@
+import datetime as dt
+
+from gee_extractor.manifest import ExportManifest, canonical_config_key
+
+
+def test_missing_returns_gaps_around_exported_ranges(tmp_path):
+    manifest = ExportManifest(tmp_path / "manifest.json")
+    manifest.record([(dt.date(2020, 1, 10), dt.date(2020, 1, 20))])
+
+    reloaded = ExportManifest(tmp_path / "manifest.json")
+    assert reloaded.missing([(dt.date(2020, 1, 1), dt.date(2020, 2, 1))]) == [
+        (dt.date(2020, 1, 1), dt.date(2020, 1, 10)),
+        (dt.date(2020, 1, 20), dt.date(2020, 2, 1)),
+    ]
+
+
+def test_record_merges_adjacent_ranges(tmp_path):
+    manifest = ExportManifest(tmp_path / "manifest.json")
+    manifest.record([(dt.date(2020, 1, 1), dt.date(2020, 1, 5))])
+    manifest.record([(dt.date(2020, 1, 5), dt.date(2020, 1, 9))])
+    assert manifest.exported == [(dt.date(2020, 1, 1), dt.date(2020, 1, 9))]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_canonical_config_key_ignores_dates():
+    config = {"satelliteId": "CHIRPS_DAILY", "when": {"startYear": 2020}}
+    other = {"satelliteId": "CHIRPS_DAILY", "when": {"startYear": 2021}}
+    assert canonical_config_key(config) == canonical_config_key(other)
+
+
+def test_record_keeps_windows_written_by_another_run(tmp_path):
+    first = ExportManifest(tmp_path / "manifest.json")
+    second = ExportManifest(tmp_path / "manifest.json")
+
+    first.record([(dt.date(2020, 1, 1), dt.date(2020, 1, 5))])
+    second.record([(dt.date(2021, 1, 1), dt.date(2021, 1, 5))])
+
+    assert ExportManifest(tmp_path / "manifest.json").exported == [
+        (dt.date(2020, 1, 1), dt.date(2020, 1, 5)),
+        (dt.date(2021, 1, 1), dt.date(2021, 1, 5)),
+    ]
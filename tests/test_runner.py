@@ -1,6 +1,7 @@
 import pytest
 
 from gee_extractor import runner
+from gee_extractor.engine import ee
 
 
 def basic_config(mask_enabled=False):
@@ -41,8 +42,75 @@ def test_run_extraction_with_mask_reports_mask_usage():
     assert summary["mask_filters"] == {"product": "temporarycrops", "season": "tc-annual"}
 
 
+def test_masked_point_extraction_still_returns_data():
+    config = basic_config(mask_enabled=True)
+    config["how"]["type"] = "Local Folder"
+    summary = runner.run_extraction(config)["summary"]
+    assert summary["images_found"] == 2
+    assert summary["export_details"]["download_url"].startswith(
+        "https://example.com/download/UCSB-CHG/CHIRPS/DAILY_0|masked"
+    )
+
+
 def test_run_extraction_invalid_config_raises():
     bad_config = basic_config()
     bad_config["when"]["startDoy"] = 400  # invalid day of year
     with pytest.raises(ValueError):
         runner.run_extraction(bad_config)
+
+
+def test_run_extraction_stack_exports_single_task():
+    config = basic_config()
+    config["how"]["stack"] = True
+    result = runner.run_extraction(config)
+    details = result["summary"]["export_details"]
+    assert details["parts"] == "1"
+    assert details["part_1_task_description"] == "chirps_test_stack"
+    assert details["part_1_bands"].startswith("precipitation_2020")
+
+
+def test_run_extraction_pack_reports_decode_parameters(monkeypatch):
+    exported_images = []
+    to_drive = ee.batch.Export.image.toDrive
+
+    def capture(**kwargs):
+        exported_images.append(kwargs["image"])
+        return to_drive(**kwargs)
+
+    monkeypatch.setattr(ee.batch.Export.image, "toDrive", staticmethod(capture))
+    config = basic_config()
+    config["how"]["pack"] = True
+    details = runner.run_extraction(config)["summary"]["export_details"]
+    assert exported_images[0].name.endswith("|uint16")
+    assert details["packing_dtype"] == "uint16"
+    assert details["precipitation_scale"] == "0.1"
+    assert details["precipitation_offset"] == "0.0"
+    assert details["precipitation_nodata"] == "65535"
+
+
+def test_incremental_run_only_exports_missing_windows(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEE_EXTRACTOR_MANIFEST_DIR", str(tmp_path))
+    config = basic_config()
+    config["how"]["incremental"] = True
+
+    first = runner.run_extraction(config)["summary"]
+    assert first["images_found"] == 2
+    assert first["export_details"]["exported_windows"] == "2020-01-01/2020-01-02"
+    assert first["export_details"]["part_1_task_description"] == "chirps_test_20200101_stack"
+
+    second = runner.run_extraction(config)["summary"]
+    assert second["images_found"] == 0
+    assert second["export_details"] == {}
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_incremental_sub_daily_run_leaves_last_day_open(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEE_EXTRACTOR_MANIFEST_DIR", str(tmp_path))
+    config = basic_config()
+    config["satelliteId"] = "ERA5_LAND_HOURLY"
+    config["what"]["bands"] = ["temperature_2m"]
+    config["when"]["endDoy"] = 4
+    config["how"]["incremental"] = True
+
+    summary = runner.run_extraction(config)["summary"]
+    assert summary["export_details"]["exported_windows"] == "2020-01-01/2020-01-02"
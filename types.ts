@@ -70,6 +70,9 @@ export interface Configuration {
     type: HowType;
     localPath: string;
     outputFilename: string;
+    stack?: boolean;
+    pack?: boolean;
+    incremental?: boolean;
   };
   settings: {
     geeProject: string;